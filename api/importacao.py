@@ -6,10 +6,12 @@ from collections import OrderedDict
 from api.sql import insert
 
 
-def usuario_importacao(database=db.SASC):
-    cursor = db.cursor(database)
-    return cursor.execute_scalar('select id from tb_usuario where usuario = %s',
-                                 'importacao')
+def usuario_importacao(database=None):
+    cursor = db.cursor(database if database is not None else db.SASC)
+    usuario = cursor.execute_scalar(
+        'select id from tb_usuario where usuario = %s', 'importacao')
+    cursor.close()
+    return usuario
 
 
 def executar_importacao(importavel, offset, limit):
@@ -14,19 +14,23 @@ class Importavel(object):
     inserir.
     """
 
-    def __init__(self, database_select=db.SASCWEB, database_insert=db.SASC):
+    def __init__(self, database_select=None, database_insert=None):
         """ Método construtor. Está garantindo que o objeto terá um database de
         origem e destino, para a importação.
 
         Args:
-            database_select (Config): Configurações do banco de dados origem.
-            database_insert (Config): Configurações do banco de dados destino.
+            database_select (Config): Configurações do banco de dados origem,
+                                      db.SASCWEB quando omitido.
+            database_insert (Config): Configurações do banco de dados destino,
+                                      db.SASC quando omitido.
 
         Returns:
             Um objeto Importável.
         """
-        self.database_select = database_select
-        self.database_insert = database_insert
+        self.database_select = (database_select if database_select is not None
+                                else db.SASCWEB)
+        self.database_insert = (database_insert if database_insert is not None
+                                else db.SASC)
         self.tabela = None
         self.query = None
         self.orderby = None
@@ -62,13 +66,8 @@ class Importavel(object):
         """
         cursor = db.cursor(self.database_select)
         if limit > 0:
-            cursor.execute_query(self.query
-                                 + ' ORDER BY '
-                                 + self.orderby
-                                 + '''
-                                  OFFSET %s ROWS
-                                  FETCH NEXT %s ROWS ONLY
-                                  ''' % (offset, limit))
+            cursor.execute_query(db.paginar(self.database_select, self.query,
+                                            self.orderby, offset, limit))
         else:
             cursor.execute_query(self.query)
         return cursor
@@ -21,7 +21,9 @@ def select_scalar(database, sql):
     """ docstring """
     print(sql)
     cursor = db.cursor(database)
-    return cursor.execute_scalar(sql)
+    resultado = cursor.execute_scalar(sql)
+    cursor.close()
+    return resultado
 
 def insert(database, tabela, colunas, tuplas):
     """ Função utilizada internamente pelo módulo, que deve utilizar um cursor
@@ -40,42 +42,24 @@ def insert(database, tabela, colunas, tuplas):
         O cursor executará todas as tuplas em um insert múltiplo.
         Atenção: O número máximo de tuplas para o SQL Server é 65.000.
     """
-    conexao_insert = db.conexao(database)
-    cursor = conexao_insert.cursor()
-
     query = ' INSERT INTO ' + tabela
     query += ' (' + ",".join(colunas) + ') '
     query += 'VALUES (' + ('%s, ' * (len(colunas) - 1)) + '%s)'
 
-    cursor.executemany(query, tuplas)
-    cursor.close()
-
-    conexao_insert.commit()
-    conexao_insert.close()
+    db.executemany(database, query, tuplas)
 
 def executar_arquivo_sql(database, sql):
     """ docstring """
-    conexao = db.conexao(database)
-    cursor = conexao.cursor()
-
     file = open(join(dirname(path[0]), 'sql', sql))
     sql = "".join(file.readlines())
     sqls = re.split(r"^GO$", sql, flags=re.MULTILINE | re.IGNORECASE)
 
-    for sql in sqls:
-        # print(sql)
-        cursor.execute(sql.encode('cp1252'))
-    conexao.commit()
-    conexao.close()
+    db.executar(database, *sqls, codificacao='cp1252')
 
 def executar_sql(database, sql):
     """ docstring """
     print(sql)
-    conexao = db.conexao(database)
-    cursor = conexao.cursor()
-    cursor.execute(sql)
-    conexao.commit()
-    conexao.close()
+    db.executar(database, sql)
 
 def filtro_item(item, **parametros):
     """ docstring """
@@ -92,7 +76,7 @@ class Tabela(object):
     armazenar uma tabela na memória.
     """
 
-    def __init__(self, tabela, colunas, fk_='id', database=db.SASC):
+    def __init__(self, tabela, colunas, fk_='id', database=None):
         """ Método construtor. Está garantindo que o objeto terá uma tabela,
         quais colunas serão armazenadas na memória, nome da fk e o banco de dados.
 
@@ -100,26 +84,25 @@ class Tabela(object):
             tabela (String): Nome da tabela que será selecionada.
             colunas (Array[String]): Lista com as colunas que devem ser gravadas.
             fk_ (String): Nome da coluna que a FK corresponde.
-            database (Config): Configurações do banco de dados da tabela.
+            database (Config): Configurações do banco de dados da tabela,
+                               db.SASC quando omitido.
 
         Returns:
             Um objeto Tabela.
         """
         self.tabela = tabela
         self.fk_ = fk_
-        self.database = database
+        self.database = database if database is not None else db.SASC
         self._tabela_mapeada = self.mapear_tabela(colunas)
 
     def mapear_tabela(self, colunas):
         """ docstring """
-        conexao = db.conexao(self.database)
-        cursor = conexao.cursor(as_dict=True)
-        cursor.execute(
+        cursor = db.cursor(self.database)
+        cursor.execute_query(
             'SELECT ' + self.fk_ + ' as fk, ' + ", ".join(colunas) +
             ' FROM ' + self.tabela)
-        tabela_mapeada = cursor.fetchall()
+        tabela_mapeada = list(cursor)
         cursor.close()
-        conexao.close()
         return tabela_mapeada
 
     def get_fk(self, **parametros):
@@ -1,30 +1,372 @@
-import pymssql
-import _mssql
+""" Camada de acesso aos bancos de dados. Os drivers são carregados somente
+quando usados pela primeira vez e o arquivo config.cfg só é lido quando alguma
+configuração (ex: db.SASC) é acessada.
+
+O driver de cada banco é escolhido pela chave 'driver' da sua configuração
+('mssql' quando omitida). Toda SQL da aplicação usa o formato de parâmetros
+'%s' (ou '%(nome)s') do pymssql: nas sentenças executadas com parâmetros,
+'%%' representa um '%' literal, como na formatação com '%' do Python. Cada
+driver traduz essas sentenças para o formato do seu banco. Sentenças sem
+parâmetros são enviadas sem alteração.
+"""
+from abc import ABC, abstractmethod
 from configparser import ConfigParser
+from functools import lru_cache
+from importlib import import_module
 from sys import path
-from os.path import join, dirname
+from os.path import join, dirname, isabs
 
 DIRETORIO = dirname(path[0])
-CONFIG = ConfigParser()
+ARQUIVO_CONFIG = join(dirname(DIRETORIO), 'config.cfg')
+DRIVER_PADRAO = 'mssql'
+TIMEOUT_SQLITE = 60
+
+
+@lru_cache(maxsize=None)
+def _config():
+    """ Lê o arquivo de configuração uma única vez, no primeiro acesso. """
+    config = ConfigParser()
+    if not config.read(ARQUIVO_CONFIG):
+        print('Erro ao ler arquivo: ', ARQUIVO_CONFIG)
+    return config
+
+
+def __getattr__(nome):
+    """ Resolve de forma preguiçosa CONFIG e as seções do config.cfg como
+    atributos do módulo, por exemplo db.DB, db.SASC e db.SASCWEB.
+    """
+    if nome == 'CONFIG':
+        return _config()
+    if nome.isupper():
+        config = _config()
+        if config.has_section(nome):
+            return config[nome]
+        raise AttributeError("module %r has no attribute %r (seção [%s] não "
+                             "encontrada em %s)" % (__name__, nome, nome,
+                                                    ARQUIVO_CONFIG))
+    raise AttributeError("module %r has no attribute %r" % (__name__, nome))
+
+
+class Driver(ABC):
+
+    """ Interface comum dos drivers de banco de dados. As subclasses devem
+    implementar conexao, cursor e paginar; as demais operações usam a DB-API.
+    """
+
+    @abstractmethod
+    def conexao(self, database):
+        """ Abre uma conexão DB-API com o banco de dados.
+
+        Args:
+            database (Config): Configurações do banco de dados.
+
+        Returns:
+            Uma conexão DB-API.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def cursor(self, database):
+        """ Abre um cursor com execute_scalar, execute_query, iteração das
+        linhas como dicionários e close.
+
+        Args:
+            database (Config): Configurações do banco de dados.
+
+        Returns:
+            Um cursor de leitura em streaming.
+        """
+        raise NotImplementedError
+
+    def sql(self, sql, params):
+        """ Traduz os parâmetros '%s' de uma sentença para o formato do
+        driver. Usado somente nas sentenças executadas com parâmetros.
+
+        Args:
+            sql (String): Sentença SQL com os parâmetros no formato '%s'.
+            params (Tuple|Dict): Parâmetros da sentença.
+
+        Returns:
+            A sentença SQL no formato do driver.
+        """
+        return sql
+
+    @abstractmethod
+    def paginar(self, sql, orderby, offset, limit):
+        """ Envolve a sentença com a paginação do banco de dados.
+
+        Args:
+            sql (String): Sentença SQL a ser paginada.
+            orderby (String): Colunas da ordenação.
+            offset (int): Número de linhas a serem puladas.
+            limit (int): Número máximo de linhas retornadas.
+
+        Returns:
+            A sentença SQL paginada.
+        """
+        raise NotImplementedError
+
+    def executar(self, database, *sqls, codificacao=None):
+        """ Executa uma ou mais sentenças na mesma conexão e faz o commit.
+
+        Args:
+            database (Config): Configurações do banco de dados.
+            *sqls (String): Sentenças SQL a serem executadas.
+            codificacao (String): Codificação usada para enviar as sentenças,
+                                  quando o driver suportar.
+        """
+        conexao = self.conexao(database)
+        try:
+            cursor = conexao.cursor()
+            for sql in sqls:
+                cursor.execute(sql)
+            conexao.commit()
+        finally:
+            conexao.close()
+
+    def executemany(self, database, sql, tuplas):
+        """ Executa a sentença para todas as tuplas em uma única conexão e
+        faz o commit.
+
+        Args:
+            database (Config): Configurações do banco de dados.
+            sql (String): Sentença SQL com os parâmetros no formato '%s'.
+            tuplas (Array[Tuple]): Lista com os parâmetros de cada execução.
+        """
+        if not tuplas:
+            return
+        conexao = self.conexao(database)
+        try:
+            cursor = conexao.cursor()
+            cursor.executemany(self.sql(sql, tuplas[0]), tuplas)
+            cursor.close()
+            conexao.commit()
+        finally:
+            conexao.close()
+
+
+class MssqlDriver(Driver):
+
+    """ Driver para o SQL Server, usando pymssql e _mssql. Os módulos só são
+    importados na primeira conexão.
+    """
+
+    def conexao(self, database):
+        pymssql = import_module('pymssql')
+        return pymssql.connect(host=database['host'],
+                               user=database['usuario'],
+                               password=database['senha'],
+                               database=database['database'])
+
+    def cursor(self, database):
+        _mssql = import_module('_mssql')
+        return _mssql.connect(server=database['host'],
+                              user=database['usuario'],
+                              password=database['senha'],
+                              database=database['database'])
+
+    def paginar(self, sql, orderby, offset, limit):
+        return (sql + ' ORDER BY ' + orderby +
+                ' OFFSET %d ROWS FETCH NEXT %d ROWS ONLY' % (offset, limit))
+
+    def executar(self, database, *sqls, codificacao=None):
+        if codificacao:
+            sqls = [sql.encode(codificacao) for sql in sqls]
+        super(MssqlDriver, self).executar(database, *sqls)
+
+
+class CursorSqlite(object):
+
+    """ Cursor do SQLite com a mesma interface do cursor do _mssql. As linhas
+    são dicionários acessíveis pelo nome e pela posição da coluna.
+    """
+
+    def __init__(self, conexao, driver):
+        self._conexao = conexao
+        self._driver = driver
+        self._resultado = None
 
+    def _executar(self, sql, params):
+        if params is None:
+            return self._conexao.execute(sql)
+        if not isinstance(params, (tuple, list, dict)):
+            params = (params,)
+        return self._conexao.execute(self._driver.sql(sql, params), params)
 
-try:
-    CONFIG.read(join(dirname(DIRETORIO), 'config.cfg'))
-    DB = CONFIG['DB']
-except KeyError:
-    print('Erro ao ler arquivo: ', str(join(dirname(DIRETORIO), 'config.cfg')))
+    def execute_scalar(self, sql, params=None):
+        """ Executa a sentença e retorna a primeira coluna da primeira linha. """
+        resultado = self._executar(sql, params)
+        linha = resultado.fetchone()
+        resultado.close()
+        return linha[0] if linha else None
+
+    def execute_query(self, sql, params=None):
+        """ Executa a sentença, as linhas são lidas ao iterar sobre o cursor. """
+        self._resultado = self._executar(sql, params)
+
+    def __iter__(self):
+        if self._resultado is None:
+            raise self._driver.sqlite3.ProgrammingError(
+                'Nenhuma consulta executada: chame execute_query antes de '
+                'iterar sobre o cursor.')
+        colunas = [coluna[0] for coluna in self._resultado.description]
+        for linha in self._resultado:
+            row = dict(enumerate(linha))
+            row.update(zip(colunas, linha))
+            yield row
+
+    def close(self):
+        self._resultado = None
+        self._conexao.close()
+
+
+class SqliteDriver(Driver):
+
+    """ Driver para o SQLite, usando o sqlite3. O módulo só é importado quando o
+    driver é criado. A chave 'database' é o caminho do arquivo ou uma
+    URI do SQLite (ex: file:importacao?mode=memory&cache=shared). Caminhos
+    relativos são resolvidos a partir do diretório do config.cfg.
+
+    Um banco em memória compartilhado é apagado quando sua última conexão é
+    fechada, por isso o driver mantém uma conexão aberta para cada URI em
+    memória. Sem cache=shared cada conexão tem o seu próprio banco.
+
+    A chave opcional 'timeout' define quantos segundos uma conexão espera por
+    um banco bloqueado por outra escrita, por exemplo nas importações com
+    várias threads.
+    """
+
+    def __init__(self):
+        self.sqlite3 = import_module('sqlite3')
+        self._memoria = {}
+        self._trava = import_module('threading').Lock()
+
+    @staticmethod
+    def _em_memoria(caminho):
+        return caminho.startswith('file:') and (
+            'mode=memory' in caminho or caminho.startswith('file::memory:'))
+
+    @staticmethod
+    def _caminho(database):
+        caminho = database['database']
+        if (caminho == ':memory:' or caminho.startswith('file:')
+                or isabs(caminho)):
+            return caminho
+        return join(dirname(ARQUIVO_CONFIG), caminho)
+
+    def _conectar(self, caminho, timeout):
+        return self.sqlite3.connect(caminho, uri=True, timeout=timeout,
+                                    check_same_thread=False)
+
+    def conexao(self, database):
+        caminho = self._caminho(database)
+        timeout = float(database.get('timeout', TIMEOUT_SQLITE))
+        if self._em_memoria(caminho):
+            with self._trava:
+                if caminho not in self._memoria:
+                    self._memoria[caminho] = self._conectar(caminho, timeout)
+        return self._conectar(caminho, timeout)
+
+    def cursor(self, database):
+        return CursorSqlite(self.conexao(database), self)
+
+    def sql(self, sql, params):
+        """ Aplica as mesmas regras do pymssql: '%s' vira '?', '%(nome)s'
+        vira ':nome' e '%%' vira '%'.
+        """
+        if isinstance(params, dict):
+            return sql % {nome: ':' + nome for nome in params}
+        return sql % (('?',) * len(params))
+
+    def paginar(self, sql, orderby, offset, limit):
+        return (sql + ' ORDER BY ' + orderby +
+                ' LIMIT %d OFFSET %d' % (limit, offset))
+
+    def executar(self, database, *sqls, codificacao=None):
+        """ Executa todas as sentenças em uma única transação, desfeita por
+        completo se alguma falhar. As sentenças não devem abrir ou fechar
+        transações por conta própria.
+        """
+        script = 'BEGIN;\n' + '\n;\n'.join(sqls) + '\n;\nCOMMIT;'
+        conexao = self.conexao(database)
+        try:
+            conexao.executescript(script)
+        except Exception:
+            conexao.rollback()
+            raise
+        finally:
+            conexao.close()
+
+
+DRIVERS = {
+    'mssql': MssqlDriver,
+    'sqlite': SqliteDriver,
+}
+
+
+def registrar_driver(nome, classe):
+    """ Registra um novo driver, que poderá ser usado pela chave 'driver' da
+    configuração do banco de dados.
+
+    Args:
+        nome (String): Nome do driver.
+        classe (Driver): Subclasse de Driver.
+
+    Raises:
+        TypeError: Quando a classe não é um Driver ou não implementa todos os
+                   métodos abstratos.
+    """
+    if not (isinstance(classe, type) and issubclass(classe, Driver)):
+        raise TypeError('O driver deve ser uma subclasse de Driver: ' +
+                        repr(classe))
+    if classe.__abstractmethods__:
+        raise TypeError('O driver ' + classe.__name__ +
+                        ' não implementa: ' +
+                        ', '.join(sorted(classe.__abstractmethods__)))
+    DRIVERS[nome] = classe
+    _instancia_driver.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _instancia_driver(nome):
+    try:
+        return DRIVERS[nome]()
+    except KeyError:
+        raise ValueError('Driver de banco de dados desconhecido: ' + nome)
+
+
+def driver(database):
+    """ Retorna o driver configurado para o banco de dados.
+
+    Args:
+        database (Config): Configurações do banco de dados.
+
+    Returns:
+        Um objeto Driver.
+    """
+    return _instancia_driver(database.get('driver', DRIVER_PADRAO))
 
 
 def conexao(database):
-    return pymssql.connect(host=database['host'],
-                           user=database['usuario'],
-                           password=database['senha'],
-                           database=database['database'])
+    """ Abre uma conexão DB-API com o banco de dados. """
+    return driver(database).conexao(database)
 
 
 def cursor(database):
-    """ docstring """
-    return _mssql.connect(server=database['host'],
-                          user=database['usuario'],
-                          password=database['senha'],
-                          database=database['database'])
+    """ Abre um cursor de leitura em streaming com o banco de dados. """
+    return driver(database).cursor(database)
+
+
+def paginar(database, sql, orderby, offset, limit):
+    """ Envolve a sentença com a paginação do banco de dados. """
+    return driver(database).paginar(sql, orderby, offset, limit)
+
+
+def executar(database, *sqls, codificacao=None):
+    """ Executa uma ou mais sentenças no banco de dados e faz o commit. """
+    driver(database).executar(database, *sqls, codificacao=codificacao)
+
+
+def executemany(database, sql, tuplas):
+    """ Executa a sentença para todas as tuplas no banco de dados. """
+    driver(database).executemany(database, sql, tuplas)
@@ -0,0 +1,72 @@
+""" Testes das funções de api.sql, api.importacao e api.modelo usando o
+driver do SQLite.
+"""
+import pytest
+
+from source import db
+from api import sql
+from api.importacao import usuario_importacao
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = {'driver': 'sqlite', 'database': str(tmp_path / 'teste.db')}
+    db.executar(database,
+                'CREATE TABLE tb_usuario (id INTEGER PRIMARY KEY, usuario TEXT)',
+                'CREATE TABLE tb_origem (codigo INTEGER, nome TEXT)',
+                'CREATE TABLE tb_destino (codigo INTEGER, nome TEXT)')
+    sql.insert(database=database, tabela='tb_usuario',
+               colunas=['id', 'usuario'],
+               tuplas=[(1, 'admin'), (2, 'importacao')])
+    sql.insert(database=database, tabela='tb_origem',
+               colunas=['codigo', 'nome'],
+               tuplas=[(i, ' nome %d ' % i) for i in range(1, 11)])
+    return database
+
+
+def test_insert_e_select_scalar(database):
+    assert sql.select_scalar(database, 'SELECT count(*) FROM tb_origem') == 10
+
+
+def test_select(database):
+    assert sql.select(database, 'SELECT id FROM tb_usuario ORDER BY id') == [
+        (1,), (2,)]
+
+
+def test_usuario_importacao(database):
+    assert usuario_importacao(database) == 2
+
+
+def test_tabela_get_fk(database):
+    tabela = sql.Tabela('tb_usuario', ['usuario'], database=database)
+    assert tabela.get_fk(usuario='IMPORTACAO') == 2
+    assert tabela.get_fk(usuario='nenhum') is None
+
+
+def test_importavel(database):
+    modelo = pytest.importorskip('api.modelo')
+
+    class Origem(modelo.Importavel):
+
+        def __init__(self):
+            super(Origem, self).__init__(database_select=database,
+                                         database_insert=database)
+            self.tabela = 'tb_destino'
+            self.query = 'SELECT codigo, nome FROM tb_origem'
+            self.orderby = 'codigo'
+
+        def dados(self, row):
+            return {'codigo': row['codigo'], 'nome': row['nome'].strip()}
+
+    origem = Origem()
+    assert origem.count() == 10
+
+    cursor = origem.select(offset=2, limit=3)
+    assert [row['codigo'] for row in cursor] == [3, 4, 5]
+    cursor.close()
+
+    origem.importar(fatia=[1, 10])
+    assert sql.select(database, 'SELECT codigo, nome FROM tb_destino '
+                                'ORDER BY codigo')[:2] == [(1, 'nome 1'),
+                                                          (2, 'nome 2')]
+    assert sql.select_scalar(database, 'SELECT count(*) FROM tb_destino') == 10
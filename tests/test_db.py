@@ -0,0 +1,271 @@
+""" Testes da camada de drivers de source.db, executados com o SQLite. """
+import sqlite3
+import subprocess
+import sys
+from os.path import dirname
+
+import pytest
+
+from source import db
+
+RAIZ = dirname(dirname(__file__))
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = {'driver': 'sqlite', 'database': str(tmp_path / 'teste.db')}
+    db.executar(database,
+                'CREATE TABLE tb_usuario (id INTEGER PRIMARY KEY, usuario TEXT)')
+    db.executemany(database,
+                   'INSERT INTO tb_usuario (id, usuario) VALUES (%s, %s)',
+                   [(1, 'admin'), (2, 'importacao'), (3, 'smith')])
+    return database
+
+
+def test_importacao_nao_le_config_nem_carrega_drivers():
+    codigo = '\n'.join([
+        'import sys',
+        'from configparser import ConfigParser',
+        'def read(*args, **kwargs):',
+        '    raise AssertionError("config.cfg lido na importação")',
+        'ConfigParser.read = read',
+        'from source import db',
+        'assert db._config.cache_info().currsize == 0',
+        'assert "pymssql" not in sys.modules',
+        'assert "_mssql" not in sys.modules',
+        'assert "sqlite3" not in sys.modules',
+    ])
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ,
+                               capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+
+
+def test_secao_inexistente_gera_attribute_error_sem_imprimir(capsys):
+    db._config()
+    capsys.readouterr()
+    assert not hasattr(db, 'SECAO_INEXISTENTE')
+    with pytest.raises(AttributeError, match=r'\[SECAO_INEXISTENTE\]'):
+        db.SECAO_INEXISTENTE
+    assert capsys.readouterr().out == ''
+
+
+def test_execute_scalar_com_parametro(database):
+    cursor = db.cursor(database)
+    assert cursor.execute_scalar(
+        'SELECT id FROM tb_usuario WHERE usuario = %s', 'importacao') == 2
+    assert cursor.execute_scalar(
+        'SELECT count(*) FROM tb_usuario WHERE id > %s AND id < %s',
+        (1, 3)) == 1
+    cursor.close()
+
+
+def test_execute_scalar_sem_resultado(database):
+    cursor = db.cursor(database)
+    assert cursor.execute_scalar(
+        'SELECT id FROM tb_usuario WHERE usuario = %s', 'nenhum') is None
+    cursor.close()
+
+
+def test_execute_query_com_parametro(database):
+    cursor = db.cursor(database)
+    cursor.execute_query('SELECT usuario FROM tb_usuario WHERE id >= %s '
+                         'ORDER BY id', 2)
+    assert [row['usuario'] for row in cursor] == ['importacao', 'smith']
+    cursor.close()
+
+
+def test_sql_segue_regras_do_pymssql():
+    driver = db.SqliteDriver()
+    assert (driver.sql("SELECT id %% 2 FROM t WHERE a = %s AND b LIKE 'x%%'",
+                       (1,))
+            == "SELECT id % 2 FROM t WHERE a = ? AND b LIKE 'x%'")
+    assert (driver.sql('SELECT 1 WHERE a = %(a)s AND b = %(b)s',
+                       {'a': 1, 'b': 2})
+            == 'SELECT 1 WHERE a = :a AND b = :b')
+
+
+def test_modulo_e_like_em_consulta_parametrizada(database):
+    cursor = db.cursor(database)
+    assert cursor.execute_scalar(
+        "SELECT count(*) FROM tb_usuario WHERE id %% 2 = %s "
+        "AND usuario LIKE 'a%%'", 1) == 1
+    cursor.execute_query(
+        'SELECT usuario FROM tb_usuario WHERE id > %(id)s ORDER BY id',
+        {'id': 1})
+    assert [row['usuario'] for row in cursor] == ['importacao', 'smith']
+    cursor.close()
+
+
+def test_executemany_com_percent(database):
+    db.executemany(database,
+                   'UPDATE tb_usuario SET usuario = usuario || %s '
+                   'WHERE id %% 2 = %s', [('_impar', 1)])
+    cursor = db.cursor(database)
+    assert cursor.execute_scalar(
+        "SELECT count(*) FROM tb_usuario WHERE usuario LIKE %s",
+        '%_impar') == 2
+    cursor.close()
+
+
+def test_linhas_por_nome_e_posicao(database):
+    cursor = db.cursor(database)
+    cursor.execute_query('SELECT id, usuario FROM tb_usuario WHERE id = 1')
+    assert list(cursor) == [{0: 1, 1: 'admin', 'id': 1, 'usuario': 'admin'}]
+    cursor.close()
+
+
+def test_iterar_sem_consulta(database):
+    cursor = db.cursor(database)
+    with pytest.raises(sqlite3.ProgrammingError):
+        list(cursor)
+    cursor.execute_query('SELECT id FROM tb_usuario')
+    cursor.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        list(cursor)
+
+
+def test_paginar(database):
+    sql = db.paginar(database, 'SELECT id FROM tb_usuario', 'id', 1, 1)
+    assert sql.endswith('ORDER BY id LIMIT 1 OFFSET 1')
+    cursor = db.cursor(database)
+    cursor.execute_query(sql)
+    assert [row['id'] for row in cursor] == [2]
+    cursor.close()
+
+
+def test_executar_varias_sentencas(database):
+    db.executar(database,
+                'CREATE TABLE tb_a (id INTEGER); INSERT INTO tb_a VALUES (1);',
+                'INSERT INTO tb_a VALUES (2)')
+    cursor = db.cursor(database)
+    assert cursor.execute_scalar('SELECT sum(id) FROM tb_a') == 3
+    cursor.close()
+
+
+def test_executar_desfaz_tudo_quando_falha(database):
+    with pytest.raises(sqlite3.OperationalError):
+        db.executar(database,
+                    "INSERT INTO tb_usuario VALUES (4, 'novo');",
+                    'INSERT INTO tb_inexistente VALUES (1)')
+    cursor = db.cursor(database)
+    assert cursor.execute_scalar('SELECT count(*) FROM tb_usuario') == 3
+    cursor.close()
+
+
+def test_timeout_configuravel(database):
+    conexao = db.conexao(dict(database, timeout='0.5'))
+    bloqueio = db.conexao(database)
+    bloqueio.execute('BEGIN EXCLUSIVE')
+    try:
+        with pytest.raises(sqlite3.OperationalError, match='locked'):
+            conexao.execute('SELECT 1 FROM tb_usuario')
+    finally:
+        bloqueio.rollback()
+        bloqueio.close()
+        conexao.close()
+
+
+def test_banco_em_memoria_compartilhado(tmp_path):
+    database = {'driver': 'sqlite',
+                'database': 'file:%s?mode=memory&cache=shared' % tmp_path}
+    db.executar(database, 'CREATE TABLE tb_a (id INTEGER)')
+    db.executemany(database, 'INSERT INTO tb_a VALUES (%s)', [(1,), (2,)])
+    cursor = db.cursor(database)
+    assert cursor.execute_scalar('SELECT count(*) FROM tb_a') == 2
+    cursor.close()
+
+
+def test_caminho_relativo_ao_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'ARQUIVO_CONFIG', str(tmp_path / 'config.cfg'))
+    db.executar({'driver': 'sqlite', 'database': 'relativo.db'},
+                'CREATE TABLE tb_a (id INTEGER)')
+    assert (tmp_path / 'relativo.db').exists()
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    monkeypatch.setattr(db, 'DRIVERS', dict(db.DRIVERS))
+    yield db.DRIVERS
+    db._instancia_driver.cache_clear()
+
+
+def test_registrar_driver(drivers):
+
+    class DriverTeste(db.SqliteDriver):
+        pass
+
+    db.registrar_driver('teste', DriverTeste)
+    assert isinstance(db.driver({'driver': 'teste'}), DriverTeste)
+
+
+def test_registrar_driver_incompleto(drivers):
+
+    class DriverIncompleto(db.Driver):
+        def conexao(self, database):
+            return None
+
+    with pytest.raises(TypeError, match='cursor, paginar'):
+        db.registrar_driver('incompleto', DriverIncompleto)
+    assert 'incompleto' not in drivers
+
+
+def test_driver_desconhecido():
+    with pytest.raises(ValueError, match='desconhecido'):
+        db.driver({'driver': 'desconhecido'})
+
+
+class ConexaoFalsa(object):
+
+    def __init__(self, **parametros):
+        self.parametros = parametros
+        self.executados = []
+        self.commits = 0
+        self.fechada = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        self.executados.append(sql)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.fechada = True
+
+
+@pytest.fixture
+def pymssql_falso(monkeypatch):
+    conexoes = []
+
+    class PymssqlFalso(object):
+
+        @staticmethod
+        def connect(**parametros):
+            conexoes.append(ConexaoFalsa(**parametros))
+            return conexoes[-1]
+
+    modulos = {'pymssql': PymssqlFalso}
+    monkeypatch.setattr(db, 'import_module', modulos.__getitem__)
+    return conexoes
+
+
+def test_mssql_paginar():
+    database = {'host': 'servidor', 'usuario': 'u', 'senha': 's',
+                'database': 'sasc'}
+    assert (db.paginar(database, 'SELECT id FROM t', 'id', 20, 10) ==
+            'SELECT id FROM t ORDER BY id OFFSET 20 ROWS FETCH NEXT 10 ROWS ONLY')
+
+
+def test_mssql_executar_com_codificacao(pymssql_falso):
+    database = {'host': 'servidor', 'usuario': 'u', 'senha': 's',
+                'database': 'sasc'}
+    db.executar(database, "SELECT 'ação'", 'SELECT 1', codificacao='cp1252')
+    conexao, = pymssql_falso
+    assert conexao.parametros == {'host': 'servidor', 'user': 'u',
+                                  'password': 's', 'database': 'sasc'}
+    assert conexao.executados == ["SELECT 'ação'".encode('cp1252'),
+                                  b'SELECT 1']
+    assert conexao.commits == 1
+    assert conexao.fechada